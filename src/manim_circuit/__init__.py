@@ -1,2 +1,6 @@
 from .mobjects import *
 from .utils import *
+from .analysis import *
+from .export import *
+from .digital import *
+from .nonlinear import *
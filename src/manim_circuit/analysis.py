@@ -0,0 +1,437 @@
+from manim import *
+from .mobjects import *
+from .utils import *
+from collections import OrderedDict
+
+# sympy is optional. It is only needed for Circuit.solve_symbolic()
+try:
+    import sympy
+except ImportError:
+    sympy = None
+
+
+# Engineering prefixes that are commonly written in component labels.
+# For example: Resistor("10k") or Capacitor("4.7u")
+SI_PREFIXES = {
+    "f": 1e-15,
+    "p": 1e-12,
+    "n": 1e-9,
+    "u": 1e-6,
+    "µ": 1e-6,
+    "m": 1e-3,
+    "k": 1e3,
+    "K": 1e3,
+    "M": 1e6,
+    "G": 1e9,
+}
+
+# Letter used to name a component that has no symbolic label.
+# Resistor(270) as the 4th part of the netlist becomes R_3 = 270
+COMPONENT_LETTERS = {
+    Resistor: "R",
+    Capacitor: "C",
+    Inductor: "L",
+    VoltageSource: "V",
+    CurrentSource: "I",
+    Opamp: "U",
+    BJT: "Q",
+    MOSFET: "M",
+}
+
+# Every symbolic solve is stored here, keyed by the circuit topology.
+# The same circuit (or one with only different numeric values) never
+# has to be solved twice. The oldest solve is dropped once the
+# cache is full.
+_SYMBOLIC_CACHE = OrderedDict()
+_SYMBOLIC_CACHE_SIZE = 64
+
+
+def parse_value(value):
+    # Returns a float for things like 270, "1.1k" or "4.7u"
+    # Returns None if the value is symbolic, like "R1"
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+
+    text = str(value).strip()
+    try:
+        return float(text)
+    except ValueError:
+        pass
+
+    if len(text) > 1 and text[-1] in SI_PREFIXES:
+        try:
+            return float(text[:-1]) * SI_PREFIXES[text[-1]]
+        except ValueError:
+            pass
+
+    return None
+
+
+def get_component_terminals(component):
+    # Returns a dictionary of terminal name -> coordinate
+    if isinstance(component, Ground):
+        return {"ground": component.get_terminals()}
+    elif isinstance(component, Source):
+        names = ["positive", "negative"]
+    elif hasattr(component, "_terminals"):
+        # Opamp (and anything else built like it) only has some terminals
+        return {
+            name: component.get_terminals(name)
+            for name, terminal in component._terminals.items()
+            if terminal is not None
+        }
+    else:
+        names = ["left", "right"]
+
+    return {name: component.get_terminals(name) for name in names}
+
+
+def find_node(circuit, coord):
+    # Returns the index of the node in circuit.node_list that touches coord
+    for i, node in enumerate(circuit.node_list):
+        if node.check_coord(coord) is not False:
+            return i
+
+    return None
+
+
+def build_netlist(circuit):
+    # Returns a list of (component, {terminal name: node index}) and
+    # the index of the reference (ground) node.
+    netlist = []
+    reference = None
+    for component in circuit.component_list:
+        terminals = {
+            name: find_node(circuit, coord)
+            for name, coord in get_component_terminals(component).items()
+        }
+        if isinstance(component, Ground):
+            if reference is None:
+                reference = terminals["ground"]
+            continue
+        netlist.append((component, terminals))
+
+    # No Ground() in the circuit, so just pick the first node.
+    if reference is None and len(circuit.node_list) > 0:
+        reference = 0
+
+    return netlist, reference
+
+
+def component_letter(component):
+    letter = COMPONENT_LETTERS.get(type(component))
+    if letter is None:
+        for cls, cls_letter in COMPONENT_LETTERS.items():
+            if isinstance(component, cls):
+                letter = cls_letter
+    return letter
+
+
+def component_names(netlist):
+    # Returns (letter, name) for every component of the netlist.
+    # Symbolic labels are used as is. Everything else gets a name based on
+    # its position in the netlist, so changing Resistor(270) to
+    # Resistor(330) does not change the topology. A generated name never
+    # matches a label, so Resistor("R_1") is never mixed up with the
+    # resistor at index 1.
+    labels = []
+    for component, _ in netlist:
+        value = getattr(component, "value", None)
+        if component_letter(component) is None or value is None:
+            labels.append(None)
+        elif parse_value(value) is None:
+            labels.append(str(value))
+        else:
+            labels.append(None)
+    used = {label for label in labels if label is not None}
+
+    names = []
+    for index, ((component, _), label) in enumerate(zip(netlist, labels)):
+        letter = component_letter(component)
+        if letter is None or label is not None:
+            names.append((letter, label))
+            continue
+
+        name = letter + "_" + str(index)
+        suffix = 1
+        while name in used:
+            name = letter + "_" + str(index) + "_" + str(suffix)
+            suffix += 1
+        used.add(name)
+        names.append((letter, name))
+
+    return names
+
+
+def get_topology(circuit):
+    netlist, reference = build_netlist(circuit)
+
+    topology = []
+    defaults = {}
+    for (component, terminals), (letter, name) in zip(
+        netlist, component_names(netlist)
+    ):
+        if letter is None:
+            continue
+
+        value = parse_value(getattr(component, "value", None))
+        if value is not None:
+            defaults[name] = value
+
+        topology.append((letter, name, tuple(sorted(terminals.items()))))
+
+    return (len(circuit.node_list), reference, tuple(topology)), defaults
+
+
+def _solve_topology(topology):
+    node_count, reference, elements = topology
+    s = sympy.Symbol("s")
+
+    # Modified nodal analysis. One row per non-reference node, and one
+    # extra row per voltage source, inductor and opamp for their branch
+    # current.
+    rows = {}
+    for node in range(node_count):
+        if node != reference:
+            rows[node] = len(rows)
+    branches = [element for element in elements if element[0] in ("V", "L", "U")]
+    size = len(rows) + len(branches)
+
+    A = sympy.zeros(size, size)
+    b = sympy.zeros(size, 1)
+
+    def stamp(row, col, value):
+        if row is not None and col is not None:
+            A[row, col] += value
+
+    symbols = [s]
+    branch = len(rows)
+    for letter, name, terminals in elements:
+        if letter in ("Q", "M"):
+            raise ValueError(
+                "Transistors are nonlinear, use Circuit.solve_dc() instead."
+            )
+        terminals = dict(terminals)
+        value = sympy.Symbol(name)
+        # Components that share a label share a symbol
+        if value not in symbols:
+            symbols.append(value)
+
+        if letter == "U":
+            # Ideal opamp: the output supplies whatever current is needed
+            # to keep both inputs at the same voltage.
+            output = terminals.get("output")
+            positive = terminals.get("positive_input")
+            negative = terminals.get("negative_input")
+            if None not in (output, positive, negative):
+                stamp(rows.get(output), branch, 1)
+                stamp(branch, rows.get(positive), 1)
+                stamp(branch, rows.get(negative), -1)
+            else:
+                # Not wired up, keep the matrix non-singular.
+                A[branch, branch] = 1
+            branch += 1
+            continue
+
+        # Two terminal elements
+        if letter in ("V", "I"):
+            a, c = terminals.get("positive"), terminals.get("negative")
+        else:
+            a, c = terminals.get("left"), terminals.get("right")
+
+        # An inductor is stamped like a voltage source with an impedance of
+        # s*L, so it is a short at DC instead of dividing by zero.
+        if letter in ("V", "L"):
+            if a is None or c is None:
+                A[branch, branch] = 1
+            else:
+                stamp(rows.get(a), branch, 1)
+                stamp(rows.get(c), branch, -1)
+                stamp(branch, rows.get(a), 1)
+                stamp(branch, rows.get(c), -1)
+                if letter == "V":
+                    b[branch] = value
+                else:
+                    A[branch, branch] = -s * value
+            branch += 1
+            continue
+
+        # A floating terminal means that no current can flow.
+        if a is None or c is None:
+            continue
+        i, j = rows.get(a), rows.get(c)
+
+        if letter == "I":
+            # The arrow points to the positive terminal.
+            if i is not None:
+                b[i] += value
+            if j is not None:
+                b[j] -= value
+            continue
+
+        if letter == "R":
+            admittance = 1 / value
+        else:
+            admittance = s * value
+
+        stamp(i, i, admittance)
+        stamp(j, j, admittance)
+        stamp(i, j, -admittance)
+        stamp(j, i, -admittance)
+
+    x = A.LUsolve(b)
+
+    # Nothing is simplified here, that can take minutes on a circuit with a
+    # few sources. Only the expressions that are looked at get simplified.
+    voltages = {}
+    for node in range(node_count):
+        if node == reference:
+            voltages[node] = sympy.Integer(0)
+        else:
+            voltages[node] = x[rows[node]]
+
+    return {
+        "symbols": tuple(symbols),
+        "voltages": voltages,
+        "functions": {},
+        "transfer_functions": {},
+        "simplified": {},
+    }
+
+
+class SymbolicSolution:
+    def __init__(self, circuit, solved, defaults, simplify=True):
+        self.circuit = circuit
+        self.symbols = solved["symbols"]
+        # Unsimplified node voltages. These are what evaluate() compiles.
+        self.voltages = solved["voltages"]
+        self.defaults = defaults
+        self.simplify = simplify
+        self._solved = solved
+
+    def _node_index(self, node):
+        if isinstance(node, int):
+            return node
+        return self.circuit.node_list.submobjects.index(node)
+
+    def _source_symbol(self, source):
+        if isinstance(source, str):
+            return sympy.Symbol(source)
+
+        netlist, _ = build_netlist(self.circuit)
+        for (component, _), (_, name) in zip(netlist, component_names(netlist)):
+            if component is source:
+                return sympy.Symbol(name)
+
+        raise ValueError("The source is not part of the circuit.")
+
+    def _display(self, key, expression):
+        # Simplified once, the first time it is asked for
+        if not self.simplify:
+            return expression
+        simplified = self._solved["simplified"]
+        if key not in simplified:
+            simplified[key] = sympy.simplify(expression)
+        return simplified[key]
+
+    def _compile(self, key, expression):
+        # lambdify once per expression. The compiled function is stored
+        # alongside the cached expression, so it is shared too. Only the
+        # symbols that appear in the expression are arguments.
+        functions = self._solved["functions"]
+        if key not in functions:
+            symbols = [
+                symbol
+                for symbol in self.symbols[1:]
+                if symbol in expression.free_symbols
+            ]
+            functions[key] = (
+                sympy.lambdify([self.symbols[0]] + symbols, expression, "numpy"),
+                [symbol.name for symbol in symbols],
+            )
+        return functions[key]
+
+    def _arguments(self, s, values, names):
+        known = {symbol.name for symbol in self.symbols[1:]}
+        unknown = [name for name in values if name not in known]
+        if len(unknown) > 0:
+            raise ValueError("Unknown values for: " + ", ".join(unknown))
+
+        arguments = [s]
+        missing = []
+        for name in names:
+            if name in values:
+                arguments.append(values[name])
+            elif name in self.defaults:
+                arguments.append(self.defaults[name])
+            else:
+                missing.append(name)
+
+        if len(missing) > 0:
+            raise ValueError("Missing values for: " + ", ".join(missing))
+
+        return arguments
+
+    def voltage(self, node):
+        index = self._node_index(node)
+        return self._display(("voltage", index), self.voltages[index])
+
+    def _transfer_function(self, node, source):
+        # The circuit is linear, so the transfer function from a source
+        # to a node is the derivative of the node voltage by the source.
+        index = self._node_index(node)
+        key = (index, self._source_symbol(source).name)
+        transfer_functions = self._solved["transfer_functions"]
+        if key not in transfer_functions:
+            transfer_functions[key] = sympy.diff(
+                self.voltages[index], sympy.Symbol(key[1])
+            )
+        return key, transfer_functions[key]
+
+    def transfer_function(self, node, source):
+        key, expression = self._transfer_function(node, source)
+        return self._display(("transfer_function",) + key, expression)
+
+    def _evaluate(self, key, expression, s, values):
+        function, names = self._compile(key, expression)
+        arguments = self._arguments(s, values, names)
+        shape = np.broadcast_shapes(*map(np.shape, arguments))
+        return function(*arguments) + np.zeros(shape)
+
+    def evaluate(self, node, s=0, **values):
+        # Every argument can be a numpy array, so a whole animation can be
+        # evaluated in one call.
+        index = self._node_index(node)
+        return self._evaluate(("voltage", index), self.voltages[index], s, values)
+
+    def evaluate_transfer_function(self, node, source, s=0, **values):
+        key, expression = self._transfer_function(node, source)
+        return self._evaluate(("transfer_function",) + key, expression, s, values)
+
+
+def solve_symbolic(circuit, simplify=True):
+    # simplify only changes what voltage() and transfer_function() return.
+    # evaluate() always uses the unsimplified expressions.
+    if sympy is None:
+        raise ImportError(
+            "solve_symbolic() requires sympy. "
+            "Install it with: pip install manim-circuit[symbolic]"
+        )
+
+    topology, defaults = get_topology(circuit)
+    if topology in _SYMBOLIC_CACHE:
+        _SYMBOLIC_CACHE.move_to_end(topology)
+    else:
+        _SYMBOLIC_CACHE[topology] = _solve_topology(topology)
+        if len(_SYMBOLIC_CACHE) > _SYMBOLIC_CACHE_SIZE:
+            _SYMBOLIC_CACHE.popitem(last=False)
+
+    solution = SymbolicSolution(circuit, _SYMBOLIC_CACHE[topology], defaults, simplify)
+
+    # Finally! Nodes know their own voltage.
+    for i, node in enumerate(circuit.node_list):
+        node.voltage = solution.voltages[i]
+
+    return solution
@@ -0,0 +1,287 @@
+from manim import *
+from .utils import *
+from .analysis import build_netlist
+
+# Each function takes a stack of input values (one row per input) and
+# returns the output. They work the same on bool arrays (one value per
+# gate) and on bit-packed uint8 arrays (eight clock cycles per byte).
+LOGIC_FUNCTIONS = {
+    "and": lambda x: np.bitwise_and.reduce(x, axis=0),
+    "or": lambda x: np.bitwise_or.reduce(x, axis=0),
+    "xor": lambda x: np.bitwise_xor.reduce(x, axis=0),
+    "nand": lambda x: ~np.bitwise_and.reduce(x, axis=0),
+    "nor": lambda x: ~np.bitwise_or.reduce(x, axis=0),
+    "xnor": lambda x: ~np.bitwise_xor.reduce(x, axis=0),
+    "not": lambda x: ~x[0],
+}
+
+
+class DigitalSimulator:
+    def __init__(self, circuit):
+        self.circuit = circuit
+        self.cycles = 0
+        self._inputs = {}
+        self._packed = None
+
+        netlist, _ = build_netlist(circuit)
+        node_count = len(circuit.node_list)
+
+        # Two extra nets: unconnected inputs read a constant low, and
+        # unconnected outputs are written to a net that nothing reads.
+        self._low = node_count
+        self._sink = node_count + 1
+        self._net_count = node_count + 2
+
+        # Every gate becomes a cell: (logic, input nets, output nets)
+        self._cells = []
+        for component, terminals in netlist:
+            if not isinstance(component, LogicGate):
+                continue
+            inputs = [
+                self._low if terminals[name] is None else terminals[name]
+                for name in component._terminals
+                if name in ("d", "clk") or name.startswith("input")
+            ]
+            outputs = [
+                self._sink if terminals[name] is None else terminals[name]
+                for name in component._terminals
+                if name in ("q", "q_bar", "output")
+            ]
+            # A flip-flop without a clock is clocked every cycle.
+            if component.logic == "dff" and terminals["clk"] is None:
+                inputs[1] = None
+            self._cells.append((component.logic, inputs, outputs))
+
+    def _node_index(self, node):
+        if isinstance(node, int):
+            return node
+        return self.circuit.node_list.submobjects.index(node)
+
+    def set_input(self, node, waveform):
+        # waveform is a sequence of 0/1 (repeated to fill every clock cycle)
+        # or a constant
+        net = self._node_index(node)
+        if any(net in cell[2] for cell in self._cells):
+            raise ValueError("This node is already driven by a gate.")
+        self._inputs[net] = waveform
+        self._packed = None
+        return self
+
+    def _levelize(self, include_flip_flops):
+        # Sort the cells into levels. Every cell only depends on the outputs
+        # of cells in earlier levels, so each level can be evaluated at once.
+        # Returns None if there is a loop.
+        cells = [
+            i
+            for i, cell in enumerate(self._cells)
+            if include_flip_flops or cell[0] != "dff"
+        ]
+        driven = set()
+        for i in cells:
+            driven.update(self._cells[i][2])
+
+        ready = set(range(self._net_count)) - driven
+        levels = []
+        while len(cells) > 0:
+            level = [
+                i
+                for i in cells
+                if all(net is None or net in ready for net in self._cells[i][1])
+            ]
+            if len(level) == 0:
+                return None
+            for i in level:
+                ready.update(self._cells[i][2])
+            done = set(level)
+            cells = [i for i in cells if i not in done]
+            levels.append(level)
+
+        return levels
+
+    def _group(self, level):
+        # Gates of the same logic and number of inputs are evaluated together
+        # on the bit-packed waveforms.
+        groups = {}
+        for i in level:
+            logic, inputs, outputs = self._cells[i]
+            groups.setdefault((logic, len(inputs)), []).append(i)
+
+        return [
+            (
+                logic,
+                np.array([self._cells[i][1] for i in cells]).T,
+                np.array([self._cells[i][2] for i in cells]).T,
+            )
+            for (logic, _), cells in groups.items()
+        ]
+
+    def _truth_table(self, level):
+        # For stepping through cycles, all the gates of a level are evaluated
+        # with one lookup: the input bits of a gate index into its truth table.
+        width = max(len(self._cells[i][1]) for i in level)
+        bits = (np.arange(2**width) >> np.arange(width)[:, None]) & 1 == 1
+
+        inputs = np.full((width, len(level)), self._low)
+        tables = np.zeros((len(level), 2**width), dtype=bool)
+        for column, i in enumerate(level):
+            logic, cell_inputs, _ = self._cells[i]
+            inputs[: len(cell_inputs), column] = cell_inputs
+            tables[column] = LOGIC_FUNCTIONS[logic](bits[: len(cell_inputs)])
+
+        outputs = np.array([self._cells[i][2][0] for i in level])
+        return inputs, tables, outputs, 1 << np.arange(width)
+
+    def _input_waveforms(self, cycles):
+        values = np.zeros((self._net_count, cycles), dtype=bool)
+        for net, waveform in self._inputs.items():
+            waveform = np.asarray(waveform, dtype=bool)
+            if waveform.ndim == 0:
+                values[net] = waveform
+            else:
+                values[net] = np.resize(waveform, cycles)
+        return values
+
+    def run(self, cycles):
+        self.cycles = cycles
+
+        # Without feedback through flip-flops, every net can be computed for
+        # every cycle at once. Otherwise, step through the cycles.
+        levels = self._levelize(include_flip_flops=True)
+        if levels is not None:
+            levels = [self._group(level) for level in levels]
+            self._packed = self._run_packed(levels, cycles)
+        else:
+            levels = self._levelize(include_flip_flops=False)
+            if levels is None:
+                raise ValueError("The circuit has a loop without a flip-flop.")
+            levels = [self._truth_table(level) for level in levels]
+            self._packed = self._run_stepped(levels, cycles)
+
+        return self
+
+    def _run_packed(self, levels, cycles):
+        # One row of bits per net, eight cycles per byte.
+        packed = np.packbits(self._input_waveforms(cycles), axis=1)
+
+        for level in levels:
+            for logic, inputs, outputs in level:
+                if logic != "dff":
+                    packed[outputs[0]] = LOGIC_FUNCTIONS[logic](packed[inputs])
+                    continue
+
+                for d, clk, q, q_bar in zip(*inputs, *outputs):
+                    state = self._sample(
+                        np.unpackbits(packed[d], count=cycles).astype(bool),
+                        (
+                            None
+                            if clk is None
+                            else np.unpackbits(packed[clk], count=cycles).astype(bool)
+                        ),
+                    )
+                    packed[q] = np.packbits(state)
+                    packed[q_bar] = np.packbits(~state)
+
+        packed[self._low] = 0
+        return packed
+
+    def _sample(self, d, clk):
+        # q takes the value d had in the cycle before a rising clock edge,
+        # and holds it until the next edge.
+        cycles = len(d)
+        previous_d = np.concatenate([[False], d[:-1]])
+        if clk is None:
+            return previous_d
+
+        edges = clk & ~np.concatenate([[False], clk[:-1]])
+        last_edge = np.maximum.accumulate(np.where(edges, np.arange(cycles), -1))
+        return np.where(last_edge >= 0, previous_d[np.maximum(last_edge, 0)], False)
+
+    def _run_stepped(self, levels, cycles):
+        inputs = self._input_waveforms(cycles)
+        flip_flops = [cell for cell in self._cells if cell[0] == "dff"]
+        d = np.array([cell[1][0] for cell in flip_flops], dtype=int)
+        clk = np.array(
+            [-1 if cell[1][1] is None else cell[1][1] for cell in flip_flops], dtype=int
+        )
+        q = np.array([cell[2][0] for cell in flip_flops], dtype=int)
+        q_bar = np.array([cell[2][1] for cell in flip_flops], dtype=int)
+        clocked = clk >= 0
+
+        input_nets = np.array(list(self._inputs), dtype=int)
+        history = np.zeros((cycles, self._net_count), dtype=bool)
+        previous = np.zeros(self._net_count, dtype=bool)
+        values = previous.copy()
+        state = np.zeros(len(flip_flops), dtype=bool)
+
+        for cycle in range(cycles):
+            values[input_nets] = inputs[input_nets, cycle]
+            values[q], values[q_bar] = state, ~state
+            # Everything is evaluated on the first cycle
+            changed = values != previous if cycle > 0 else np.ones_like(values)
+            self._settle(levels, values, changed)
+
+            # Rising clock edges. A flip-flop clocked by another flip-flop only
+            # sees its edge once that one has switched, so repeat until the
+            # edges stop changing.
+            held = state
+            edges = np.zeros(len(flip_flops), dtype=bool)
+            for _ in range(len(flip_flops) + 1):
+                new_edges = ~clocked
+                new_edges[clocked] = values[clk[clocked]] & ~previous[clk[clocked]]
+                if np.array_equal(new_edges, edges):
+                    break
+                edges = new_edges
+                state = np.where(edges, previous[d], held)
+                before = values.copy()
+                values[q], values[q_bar] = state, ~state
+                self._settle(levels, values, values != before)
+
+            history[cycle] = values
+            previous = values.copy()
+
+        return np.packbits(history.T, axis=1)
+
+    def _settle(self, levels, values, changed):
+        # Event driven: a gate is only evaluated if one of its inputs changed.
+        for inputs, tables, outputs, weights in levels:
+            active = np.flatnonzero(changed[inputs].any(axis=0))
+            if len(active) == 0:
+                continue
+            new = tables[active, weights @ values[inputs[:, active]]]
+            out = outputs[active]
+            changed[out[new != values[out]]] = True
+            values[out] = new
+
+    def waveform(self, node):
+        if self._packed is None:
+            raise ValueError("Call run() before reading the waveforms.")
+        net = self._node_index(node)
+        return np.unpackbits(self._packed[net], count=self.cycles).astype(bool)
+
+    def _bit(self, cycle):
+        # Byte and bit mask of a cycle in the packed waveforms. The last byte
+        # is padded, so cycles past the end are not read.
+        if self._packed is None:
+            raise ValueError("Call run() before reading the waveforms.")
+        if not 0 <= cycle < self.cycles:
+            raise ValueError(
+                f"cycle must be between 0 and {self.cycles - 1}, the last cycle run."
+            )
+        return cycle // 8, 0x80 >> (cycle % 8)
+
+    def level(self, node, cycle):
+        byte, bit = self._bit(cycle)
+        net = self._node_index(node)
+        return bool(self._packed[net, byte] & bit)
+
+    def get_colors(self, cycle, high=GREEN, low=BLUE):
+        byte, bit = self._bit(cycle)
+        bits = self._packed[: len(self.circuit.node_list), byte] & bit
+        return [high if b else low for b in bits]
+
+    def color_nodes(self, cycle, high=GREEN, low=BLUE):
+        # Handy inside an updater, to color the wires every frame
+        colors = self.get_colors(cycle, high, low)
+        for node, color in zip(self.circuit.node_list, colors):
+            node.set_color(color)
+        return self.circuit
@@ -0,0 +1,253 @@
+from manim import *
+from manim.animation.animation import prepare_animation
+from .utils import *
+from .analysis import get_component_terminals
+import gzip
+import json
+
+
+def _round(coord):
+    return np.round(np.array(coord, dtype=float), 6).tolist()
+
+
+def _voltage(value):
+    # Numbers (and sympy numbers) become floats. Symbolic voltages that
+    # still have free symbols cannot be exported, so they become None.
+    if value is None:
+        return None
+    try:
+        return float(np.real(complex(value)))
+    except (TypeError, ValueError):
+        return None
+
+
+# Terminals on the left of a component when it is created. The rest of the
+# terminals are on the right, except for the opamp bias terminals.
+_LEFT_TERMINALS = ("base", "gate", "d", "clk", "positive_input", "negative_input")
+
+
+def _angle(component):
+    # How far the component is rotated (counterclockwise, in radians), found
+    # from two points that are level (or above each other) when it is created.
+    terminals = get_component_terminals(component)
+    if isinstance(component, Ground):
+        start, end = component.main_body.get_center(), terminals["ground"]
+        reference = PI / 2
+    elif isinstance(component, Source):
+        start, end = terminals["negative"], terminals["positive"]
+        reference = PI / 2
+    elif "left" in terminals:
+        start, end = terminals["left"], terminals["right"]
+        reference = 0
+    else:
+        left = [
+            coord
+            for name, coord in terminals.items()
+            if name in _LEFT_TERMINALS or name.startswith("input")
+        ]
+        right = [
+            coord
+            for name, coord in terminals.items()
+            if not (name in _LEFT_TERMINALS or name.startswith("input"))
+            and not name.endswith("bias")
+        ]
+        if len(left) == 0 or len(right) == 0:
+            return 0.0
+        start, end = np.mean(left, axis=0), np.mean(right, axis=0)
+        reference = 0
+
+    direction = np.array(end, dtype=float) - np.array(start, dtype=float)
+    angle = np.arctan2(direction[1], direction[0]) - reference
+    # Wrap to (-PI, PI]
+    return float(-((-angle + PI) % TAU - PI)) + 0.0
+
+
+class FrameDataExporter:
+    # Streams the state of Circuit(s) as line-delimited JSON.
+    # The first line describes the export, every other line is one frame.
+    # Nothing is rasterized, and only one frame is held in memory at a time.
+    def __init__(
+        self,
+        file,
+        frame_rate=None,
+        scene=None,
+        circuits=None,
+        solve=None,
+    ):
+        if isinstance(file, str):
+            if file.endswith(".gz"):
+                self._file = gzip.open(file, "wt")
+            else:
+                self._file = open(file, "w")
+            self._owns_file = True
+        else:
+            self._file = file
+            self._owns_file = False
+
+        self.frame_rate = config.frame_rate if frame_rate is None else frame_rate
+        self.scene = scene
+        self.circuits = circuits
+        # solve(circuit, time) returns one voltage per node of the circuit.
+        # It is called for every circuit, so it works on circuits that are
+        # only created inside construct().
+        self.solve = solve
+        self.frame = 0
+        self.time = 0
+
+        self._write({"format": "manim-circuit-frames", "frame_rate": self.frame_rate})
+
+    def _write(self, data):
+        self._file.write(json.dumps(data, separators=(",", ":")) + "\n")
+
+    def get_circuits(self):
+        if self.circuits is not None:
+            return self.circuits
+        if self.scene is None:
+            return []
+        return [
+            mob
+            for mob in self.scene.get_mobject_family_members()
+            if isinstance(mob, Circuit)
+        ]
+
+    def get_voltages(self, circuit):
+        if self.solve is not None:
+            voltages = self.solve(circuit, self.time)
+            if voltages is None:
+                return None
+            return [_voltage(v) for v in voltages]
+
+        # Otherwise use the voltages that solve_symbolic() or solve_dc()
+        # stored on the nodes, as long as they are numbers.
+        return [_voltage(getattr(node, "voltage", None)) for node in circuit.node_list]
+
+    def get_circuit_state(self, circuit):
+        voltages = self.get_voltages(circuit)
+
+        nodes = []
+        for i, node in enumerate(circuit.node_list):
+            nodes.append(
+                {
+                    "id": i,
+                    "color": node.get_color().to_hex(),
+                    "opacity": float(node.get_stroke_opacity()),
+                    "voltage": None if voltages is None else voltages[i],
+                    "coords": [
+                        [_round(coord) for coord in wire] for wire in node.coords
+                    ],
+                    "junctions": [
+                        _round(dot.get_center()) for dot in node.junction_dots
+                    ],
+                }
+            )
+
+        components = []
+        for i, component in enumerate(circuit.component_list):
+            components.append(
+                {
+                    "id": i,
+                    "type": type(component).__name__,
+                    "center": _round(component.get_center()),
+                    "angle": round(_angle(component), 6),
+                    "width": float(component.width),
+                    "height": float(component.height),
+                    "terminals": {
+                        name: _round(coord)
+                        for name, coord in get_component_terminals(component).items()
+                    },
+                }
+            )
+
+        return {"nodes": nodes, "components": components}
+
+    def write_frame(self):
+        self._write(
+            {
+                "frame": self.frame,
+                "time": round(self.time, 6),
+                "circuits": [
+                    self.get_circuit_state(circuit) for circuit in self.get_circuits()
+                ],
+            }
+        )
+        self.frame += 1
+
+    def _update_mobjects(self, dt):
+        if self.scene is not None:
+            for mob in self.scene.mobjects:
+                mob.update(dt)
+
+    def _advance_time(self, dt):
+        # Updaters often read the scene time, e.g. self.renderer.time
+        self.time += dt
+        if self.scene is None:
+            return
+        # Scene.time reads the renderer time, so advancing one is enough.
+        if getattr(self.scene, "renderer", None) is not None:
+            self.scene.renderer.time += dt
+        elif hasattr(self.scene, "time"):
+            self.scene.time += dt
+
+    def play(self, *args, **kwargs):
+        # Same idea as Scene.play(), but each frame is written instead of rendered.
+        kwargs.pop("subcaption", None)
+        kwargs.pop("subcaption_duration", None)
+        kwargs.pop("subcaption_offset", None)
+
+        animations = [prepare_animation(anim) for anim in args]
+        for animation in animations:
+            for key, value in kwargs.items():
+                setattr(animation, key, value)
+            if self.scene is not None:
+                animation._setup_scene(self.scene)
+            animation.begin()
+
+        run_time = max([animation.get_run_time() for animation in animations] + [0])
+        frames = max(1, int(round(run_time * self.frame_rate)))
+        dt = run_time / frames
+        for frame in range(1, frames + 1):
+            t = frame * dt
+            for animation in animations:
+                animation.update_mobjects(dt)
+                animation.interpolate(min(t / max(animation.get_run_time(), 1e-9), 1))
+            self._update_mobjects(dt)
+            self._advance_time(dt)
+            self.write_frame()
+
+        for animation in animations:
+            animation.finish()
+            if self.scene is not None:
+                animation.clean_up_from_scene(self.scene)
+
+    def wait(self, duration=DEFAULT_WAIT_TIME, *args, **kwargs):
+        frames = max(1, int(round(duration * self.frame_rate)))
+        dt = duration / frames
+        for _ in range(frames):
+            self._update_mobjects(dt)
+            self._advance_time(dt)
+            self.write_frame()
+
+    def close(self):
+        self._file.flush()
+        if self._owns_file:
+            self._file.close()
+
+
+def export_frame_data(scene, file, frame_rate=None, solve=None):
+    # Runs scene.construct() without rendering a single pixel.
+    # scene can be a Scene instance, or the Scene class itself.
+    if isinstance(scene, type):
+        scene = scene()
+
+    exporter = FrameDataExporter(file, frame_rate=frame_rate, scene=scene, solve=solve)
+    scene.play = exporter.play
+    scene.wait = exporter.wait
+
+    try:
+        scene.setup()
+        scene.construct()
+        scene.tear_down()
+    finally:
+        exporter.close()
+
+    return exporter
@@ -39,6 +39,7 @@ class Inductor(VMobject):
         # initialize the vmobject
         super().__init__(**kwargs)
         self._direction = direction
+        self.value = label
 
         self.main_body = (
             ParametricFunction(
@@ -91,6 +92,7 @@ class Resistor(VMobject):
         # initialize the vmobject
         super().__init__(**kwargs)
         self._direction = direction
+        self.value = label
 
         # Less points, more cleaner!
         self.main_body = VMobject()
@@ -151,6 +153,7 @@ class Capacitor(VMobject):
         # initialize the vmobject
         super().__init__(**kwargs)
         self._direction = direction
+        self.value = label
 
         self.main_body = VGroup(
             Line([(7 / 4.42) - 0.125, 1, 0], [(7 / 4.42) - 0.125, -1, 0]),
@@ -290,7 +293,7 @@ class Opamp(VMobject):
                 self.main_body.get_left() + [-0.25, self.main_body.height / 4, 0]
             ).set_opacity(0)
         )
-        self._terminals["positive_input"] = self._plots[-1].get_center()
+        self._terminals["positive_input"] = self._plots[-1]
 
         self._neg_rail = Line(
             (self.main_body.get_left() - [0, self.main_body.height / 4, 0]),
@@ -301,13 +304,13 @@ class Opamp(VMobject):
                 self.main_body.get_left() - [0.25, self.main_body.height / 4, 0]
             ).set_opacity(0)
         )
-        self._terminals["negative_input"] = self._plots[-1].get_center()
+        self._terminals["negative_input"] = self._plots[-1]
 
         self._output_rail = Line(
             self.main_body.get_right(), (self.main_body.get_right() + [0.25, 0, 0])
         )
         self._plots.add(Dot(self.main_body.get_right() + [0.25, 0, 0]).set_opacity(0))
-        self._terminals["output"] = self._plots[-1].get_center()
+        self._terminals["output"] = self._plots[-1]
 
         self.rails = VGroup(self._pos_rail, self._neg_rail, self._output_rail)
 
@@ -329,7 +332,7 @@ class Opamp(VMobject):
                     + [0, 0.25, 0]
                 ).set_opacity(0)
             )
-            self._terminals["positive_bias"] = self._plots[-1].get_center()
+            self._terminals["positive_bias"] = self._plots[-1]
 
         if "negative" == bias_supply or "both" == bias_supply:
             self._negative_bias = Line(
@@ -350,8 +353,270 @@ class Opamp(VMobject):
                 ).set_opacity(0)
             )
 
-            self._terminals["negative_bias"] = self._plots[-1].get_center()
+            self._terminals["negative_bias"] = self._plots[-1]
         self.add(self.rails, self._labels, self._plots)
 
     def get_terminals(self, val):
-        return self._terminals[val]
+        # The terminals are invisible Dot()s, so they follow shift/rotate.
+        # Bias terminals stay None without a bias supply.
+        if self._terminals[val] is None:
+            return None
+        return self._terminals[val].get_center()
+
+
+def _and_body():
+    # Flat back, round front
+    return VGroup(
+        Line([-0.5, 0.5, 0], [0, 0.5, 0]),
+        ArcBetweenPoints([0, 0.5, 0], [0, -0.5, 0], angle=-PI),
+        Line([0, -0.5, 0], [-0.5, -0.5, 0]),
+        Line([-0.5, -0.5, 0], [-0.5, 0.5, 0]),
+    )
+
+
+def _or_body(exclusive=False):
+    # Curved back, pointed front
+    body = VGroup(
+        ArcBetweenPoints([-0.5, -0.5, 0], [-0.5, 0.5, 0], angle=PI / 3),
+        ArcBetweenPoints([-0.5, 0.5, 0], [0.5, 0, 0], angle=-PI / 4),
+        ArcBetweenPoints([0.5, 0, 0], [-0.5, -0.5, 0], angle=-PI / 4),
+    )
+    if exclusive:
+        body.add(
+            ArcBetweenPoints([-0.65, -0.5, 0], [-0.65, 0.5, 0], angle=PI / 3),
+        )
+    return body
+
+
+class AndGate(LogicGate):
+    logic = "and"
+
+    def __init__(self, label=None, **kwargs):
+        super().__init__(
+            _and_body(), inputs=["input_a", "input_b"], label=label, **kwargs
+        )
+
+
+class NandGate(LogicGate):
+    logic = "nand"
+
+    def __init__(self, label=None, **kwargs):
+        super().__init__(
+            _and_body(),
+            inputs=["input_a", "input_b"],
+            inverted=True,
+            label=label,
+            **kwargs,
+        )
+
+
+class OrGate(LogicGate):
+    logic = "or"
+
+    def __init__(self, label=None, **kwargs):
+        super().__init__(
+            _or_body(), inputs=["input_a", "input_b"], inset=0.1, label=label, **kwargs
+        )
+
+
+class NorGate(LogicGate):
+    logic = "nor"
+
+    def __init__(self, label=None, **kwargs):
+        super().__init__(
+            _or_body(),
+            inputs=["input_a", "input_b"],
+            inverted=True,
+            inset=0.1,
+            label=label,
+            **kwargs,
+        )
+
+
+class XorGate(LogicGate):
+    logic = "xor"
+
+    def __init__(self, label=None, **kwargs):
+        super().__init__(
+            _or_body(exclusive=True),
+            inputs=["input_a", "input_b"],
+            inset=0.1,
+            label=label,
+            **kwargs,
+        )
+
+
+class XnorGate(LogicGate):
+    logic = "xnor"
+
+    def __init__(self, label=None, **kwargs):
+        super().__init__(
+            _or_body(exclusive=True),
+            inputs=["input_a", "input_b"],
+            inverted=True,
+            inset=0.1,
+            label=label,
+            **kwargs,
+        )
+
+
+class NotGate(LogicGate):
+    logic = "not"
+
+    def __init__(self, label=None, **kwargs):
+        super().__init__(
+            VGroup(Polygon([-0.4, 0.4, 0], [0.4, 0, 0], [-0.4, -0.4, 0])),
+            inputs=["input"],
+            inverted=True,
+            label=label,
+            **kwargs,
+        )
+
+
+class DFlipFlop(LogicGate):
+    logic = "dff"
+
+    def __init__(self, label=None, **kwargs):
+        # Box, with a clock marker next to the clk input
+        body = VGroup(
+            Rectangle(width=1, height=1.5),
+            Polygon([-0.5, -0.25, 0], [-0.35, -0.375, 0], [-0.5, -0.5, 0]),
+        )
+        body.add(
+            MathTex("D").scale(0.5).move_to([-0.3, 0.375, 0]),
+            MathTex("Q").scale(0.5).move_to([0.3, 0.375, 0]),
+            MathTex(r"\overline{Q}").scale(0.5).move_to([0.3, -0.375, 0]),
+        )
+        super().__init__(
+            body,
+            inputs=["d", "clk"],
+            outputs=["q", "q_bar"],
+            label=label,
+            **kwargs,
+        )
+
+
+class BJT(VMobject):
+    def __init__(
+        self,
+        polarity="npn",
+        label=None,
+        beta=100,
+        saturation_current=1e-14,
+        circle=True,
+        **kwargs,
+    ):
+        # initialize the vmobject
+        super().__init__(**kwargs)
+
+        # Model parameters for the DC solver
+        self.value = label
+        self.polarity = polarity
+        self.beta = beta
+        self.saturation_current = saturation_current
+
+        self._plots = VGroup()
+        self._terminals = {"base": None, "collector": None, "emitter": None}
+
+        # Base bar, collector and emitter
+        self.main_body = VGroup(
+            Line([0, 0.35, 0], [0, -0.35, 0]),
+            Line([0, 0.15, 0], [0.4, 0.4, 0]),
+        )
+
+        # The arrow on the emitter points out for npn, and in for pnp
+        if polarity == "npn":
+            emitter = Line([0, -0.15, 0], [0.4, -0.4, 0])
+        else:
+            emitter = Line([0.4, -0.4, 0], [0, -0.15, 0])
+        self.main_body.add(emitter.add_tip(tip_shape=StealthTip, tip_length=0.15))
+
+        if circle:
+            self.main_body.add(Circle(radius=0.55).move_to([0.15, 0, 0]))
+        self.main_body.set_color(WHITE)
+        self.add(self.main_body)
+
+        # Rails
+        self.rails = VGroup(
+            Line([0, 0, 0], [-0.5, 0, 0]),
+            Line([0.4, 0.4, 0], [0.4, 0.75, 0]),
+            Line([0.4, -0.4, 0], [0.4, -0.75, 0]),
+        )
+        for name, rail in zip(["base", "collector", "emitter"], self.rails):
+            self._plots.add(Dot(rail.get_end()).set_opacity(0))
+            self._terminals[name] = self._plots[-1]
+
+        self._labels = VGroup()
+        if label is not None:
+            self._labels.add(
+                MathTex(str(label)).scale(0.5).next_to(self.main_body, RIGHT, buff=0.1)
+            )
+
+        self.add(self.rails, self._labels, self._plots)
+
+    def get_terminals(self, val):
+        # The terminals are invisible Dot()s, so they follow shift/rotate
+        return self._terminals[val].get_center()
+
+
+class MOSFET(VMobject):
+    def __init__(
+        self,
+        channel="n",
+        label=None,
+        threshold=1,
+        transconductance=1e-3,
+        channel_length_modulation=0,
+        **kwargs,
+    ):
+        # initialize the vmobject
+        super().__init__(**kwargs)
+
+        # Model parameters for the DC solver. threshold is the magnitude
+        # of the threshold voltage, for both channel types.
+        self.value = label
+        self.channel = channel
+        self.threshold = threshold
+        self.transconductance = transconductance
+        self.channel_length_modulation = channel_length_modulation
+
+        self._plots = VGroup()
+        self._terminals = {"gate": None, "drain": None, "source": None}
+
+        # Gate plate, channel, drain and source
+        self.main_body = VGroup(
+            Line([-0.1, 0.3, 0], [-0.1, -0.3, 0]),
+            Line([0, 0.4, 0], [0, -0.4, 0]),
+            Line([0, 0.25, 0], [0.4, 0.25, 0]),
+        )
+
+        # The arrow on the source points in for n channel, and out for p
+        if channel == "n":
+            source = Line([0.4, -0.25, 0], [0, -0.25, 0])
+        else:
+            source = Line([0, -0.25, 0], [0.4, -0.25, 0])
+        self.main_body.add(source.add_tip(tip_shape=StealthTip, tip_length=0.15))
+        self.main_body.set_color(WHITE)
+        self.add(self.main_body)
+
+        # Rails
+        self.rails = VGroup(
+            Line([-0.1, 0, 0], [-0.5, 0, 0]),
+            Line([0.4, 0.25, 0], [0.4, 0.75, 0]),
+            Line([0.4, -0.25, 0], [0.4, -0.75, 0]),
+        )
+        for name, rail in zip(["gate", "drain", "source"], self.rails):
+            self._plots.add(Dot(rail.get_end()).set_opacity(0))
+            self._terminals[name] = self._plots[-1]
+
+        self._labels = VGroup()
+        if label is not None:
+            self._labels.add(
+                MathTex(str(label)).scale(0.5).next_to(self.main_body, RIGHT, buff=0.1)
+            )
+
+        self.add(self.rails, self._labels, self._plots)
+
+    def get_terminals(self, val):
+        # The terminals are invisible Dot()s, so they follow shift/rotate
+        return self._terminals[val].get_center()
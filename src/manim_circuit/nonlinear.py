@@ -0,0 +1,483 @@
+from manim import *
+from .mobjects import *
+from .utils import *
+from .analysis import build_netlist, component_names, get_topology
+from scipy import sparse
+from scipy.sparse.linalg import splu
+
+# Thermal voltage at room temperature, in volts
+THERMAL_VOLTAGE = 0.025852
+
+# Reverse current gain used for every BJT
+REVERSE_BETA = 1
+
+# Tiny conductance from every node to ground, so floating nodes (like the
+# gate of a MOSFET) do not make the matrix singular. Same idea as in SPICE.
+GMIN = 1e-12
+
+# exp() continues as a straight line past this, so that a bad Newton step
+# cannot overflow.
+MAX_EXPONENT = 40
+
+
+def _limited_exp(x):
+    # Returns exp(x) and its derivative
+    clipped = np.minimum(x, MAX_EXPONENT)
+    slope = np.exp(clipped)
+    return slope * (1 + x - clipped), slope
+
+
+def _critical_voltage(saturation_current):
+    # Junction voltage where the diode current starts to take off
+    return THERMAL_VOLTAGE * np.log(THERMAL_VOLTAGE / (np.sqrt(2) * saturation_current))
+
+
+def _limit_junction(new, old, saturation_current):
+    # Same as pnjlim in SPICE. A forward biased junction can only move a
+    # few thermal voltages per iteration, otherwise exp() explodes.
+    critical = _critical_voltage(saturation_current)
+    limit = (new > critical) & (np.abs(new - old) > 2 * THERMAL_VOLTAGE)
+    arg = 1 + (new - old) / THERMAL_VOLTAGE
+    limited = np.where(
+        old > 0,
+        np.where(
+            arg > 0,
+            old + THERMAL_VOLTAGE * np.log(np.maximum(arg, 1e-300)),
+            critical,
+        ),
+        THERMAL_VOLTAGE * np.log(np.maximum(new, 1e-300) / THERMAL_VOLTAGE),
+    )
+    return np.where(limit, limited, new), limit.any()
+
+
+class DCSolver:
+    # Finds the DC operating point of a circuit with Newton-Raphson.
+    # Keep one around while animating: every solve starts from the last
+    # solution, and the sparsity pattern of the Jacobian is only built once.
+    def __init__(self, circuit, tolerance=1e-6, max_iterations=100):
+        self.circuit = circuit
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+        self.iterations = 0
+        self.topology, self.defaults = get_topology(circuit)
+        self.components = list(circuit.component_list)
+
+        netlist, reference = build_netlist(circuit)
+        self._node_count = len(circuit.node_list)
+        self._rows = {}
+        for node in range(self._node_count):
+            if node != reference:
+                self._rows[node] = len(self._rows)
+        self._size = len(self._rows)
+        node_rows = list(self._rows.values())
+
+        # -1 is the reference node
+        def row(node):
+            return self._rows.get(node, -1)
+
+        def new_row():
+            self._size += 1
+            return self._size - 1
+
+        # An unconnected transistor terminal gets a node of its own
+        def device_row(node):
+            if node is None:
+                node_rows.append(new_row())
+                return node_rows[-1]
+            return row(node)
+
+        # Linear entries are coefficient / value, or just coefficient if
+        # there is no name.
+        linear = []
+        sources = []
+        bjts = []
+        mosfets = []
+
+        def stamp(r, c, coefficient, name=None):
+            if r >= 0 and c >= 0:
+                linear.append((r, c, coefficient, name))
+
+        for (component, terminals), (letter, name) in zip(
+            netlist, component_names(netlist)
+        ):
+            if letter is None:
+                continue
+
+            if letter == "Q":
+                bjts.append(
+                    (
+                        component,
+                        [
+                            device_row(terminals[t])
+                            for t in ("collector", "base", "emitter")
+                        ],
+                    )
+                )
+                continue
+
+            if letter == "M":
+                mosfets.append(
+                    (
+                        component,
+                        [device_row(terminals[t]) for t in ("drain", "gate", "source")],
+                    )
+                )
+                continue
+
+            if letter == "U":
+                # Ideal opamp, same as in the symbolic solver
+                output = terminals.get("output")
+                positive = terminals.get("positive_input")
+                negative = terminals.get("negative_input")
+                if None not in (output, positive, negative):
+                    k = new_row()
+                    stamp(row(output), k, 1)
+                    stamp(k, row(positive), 1)
+                    stamp(k, row(negative), -1)
+                continue
+
+            # Two terminal elements
+            if letter in ("V", "I"):
+                a, c = terminals.get("positive"), terminals.get("negative")
+            else:
+                a, c = terminals.get("left"), terminals.get("right")
+
+            # A floating terminal means that no current can flow.
+            # Capacitors are open at DC.
+            if a is None or c is None or letter == "C":
+                continue
+            i, j = row(a), row(c)
+
+            # Inductors are shorts at DC, so they are 0 V sources.
+            if letter in ("V", "L"):
+                k = new_row()
+                stamp(i, k, 1)
+                stamp(j, k, -1)
+                stamp(k, i, 1)
+                stamp(k, j, -1)
+                if letter == "V":
+                    sources.append((k, 1, name))
+            elif letter == "I":
+                # The arrow points to the positive terminal.
+                sources.append((i, 1, name))
+                sources.append((j, -1, name))
+            else:
+                stamp(i, i, 1, name)
+                stamp(j, j, 1, name)
+                stamp(i, j, -1, name)
+                stamp(j, i, -1, name)
+
+        self._linear = linear
+        self._sources = [source for source in sources if source[0] >= 0]
+        self._node_rows = np.array(node_rows, dtype=int)
+
+        self._bjts = [bjt for bjt, _ in bjts]
+        self._bjt_nodes = np.array([nodes for _, nodes in bjts], dtype=int).reshape(
+            -1, 3
+        )
+        self._mosfets = [mos for mos, _ in mosfets]
+        self._mos_nodes = np.array([nodes for _, nodes in mosfets], dtype=int).reshape(
+            -1, 3
+        )
+        self._names = {entry[3] for entry in self._linear if entry[3] is not None}
+        self._names |= {source[2] for source in self._sources}
+
+        self.__read_parameters()
+        self.__build_pattern()
+        self._x = np.zeros(self._size)
+        self._junctions = self.__initial_junctions()
+        self._solved = False
+
+    def __read_parameters(self):
+        # Transistor parameters as arrays, so all of them are evaluated at once.
+        # They are read again on every solve(), so changing bjt.beta (or any
+        # other parameter) takes effect without building a new solver.
+        self._bjt_polarity = np.array(
+            [1 if bjt.polarity == "npn" else -1 for bjt in self._bjts]
+        )
+        self._bjt_is = np.array([bjt.saturation_current for bjt in self._bjts])
+        self._bjt_beta = np.array([bjt.beta for bjt in self._bjts])
+
+        self._mos_polarity = np.array(
+            [1 if mos.channel == "n" else -1 for mos in self._mosfets]
+        )
+        self._mos_threshold = np.array([mos.threshold for mos in self._mosfets])
+        self._mos_k = np.array([mos.transconductance for mos in self._mosfets])
+        self._mos_lambda = np.array(
+            [mos.channel_length_modulation for mos in self._mosfets]
+        )
+
+    def __initial_junctions(self):
+        # Cold start: base-emitter junctions at the critical voltage, and
+        # base-collector junctions off. Same as SPICE.
+        return (
+            _critical_voltage(self._bjt_is),
+            np.zeros(len(self._bjt_is)),
+        )
+
+    def __build_pattern(self):
+        # The Jacobian always has the same non-zero entries, so work out
+        # once where every stamp goes in the data array of a CSC matrix.
+        # Each iteration then only has to add up the new values.
+        bjt = self._bjt_nodes
+        mos = self._mos_nodes
+        device_rows = np.concatenate(
+            [
+                np.repeat(bjt, 3, axis=1).reshape(-1),
+                np.repeat(mos[:, [0, 2]], 3, axis=1).reshape(-1),
+            ]
+        ).astype(int)
+        device_cols = np.concatenate(
+            [np.tile(bjt, 3).reshape(-1), np.tile(mos, 2).reshape(-1)]
+        ).astype(int)
+        self._device_mask = (device_rows >= 0) & (device_cols >= 0)
+
+        rows = np.concatenate(
+            [
+                np.array([entry[0] for entry in self._linear], dtype=int),
+                self._node_rows,
+                device_rows[self._device_mask],
+            ]
+        )
+        cols = np.concatenate(
+            [
+                np.array([entry[1] for entry in self._linear], dtype=int),
+                self._node_rows,
+                device_cols[self._device_mask],
+            ]
+        )
+
+        keys, inverse = np.unique(cols * self._size + rows, return_inverse=True)
+        self._indices = keys % self._size
+        self._indptr = np.searchsorted(keys // self._size, np.arange(self._size + 1))
+        self._nnz = len(keys)
+
+        linear_count = len(self._linear)
+        gmin_count = len(self._node_rows)
+        self._linear_slots = inverse[:linear_count]
+        self._gmin_slots = inverse[linear_count : linear_count + gmin_count]
+        self._device_slots = inverse[linear_count + gmin_count :]
+
+        # Rows that the terminal currents flow into (-1 is dropped later)
+        self._current_rows = np.concatenate(
+            [bjt.reshape(-1), mos[:, [0, 2]].reshape(-1)]
+        ).astype(int)
+
+    def _matrix(self, data):
+        return sparse.csc_matrix(
+            (data, self._indices, self._indptr), shape=(self._size, self._size)
+        )
+
+    def _devices(self, x, junctions, initial=False):
+        # Returns the currents flowing into every transistor terminal, the
+        # values of their Jacobian stamps, the limited BJT junction voltages
+        # and whether any of them had to be limited.
+        # Index -1 (the reference node) reads 0 V.
+        v = np.append(x, 0.0)
+
+        # Ebers-Moll transport model, linearized around the limited
+        # junction voltages
+        c, b, e = self._bjt_nodes.T
+        p = self._bjt_polarity
+        saturation = self._bjt_is
+        vbe, vbc = p * (v[b] - v[e]), p * (v[b] - v[c])
+        if initial:
+            (vbe_limited, vbc_limited), limited_be, limited_bc = junctions, True, True
+        else:
+            vbe_limited, limited_be = _limit_junction(vbe, junctions[0], saturation)
+            vbc_limited, limited_bc = _limit_junction(vbc, junctions[1], saturation)
+        exp_be, slope_be = _limited_exp(vbe_limited / THERMAL_VOLTAGE)
+        exp_bc, slope_bc = _limited_exp(vbc_limited / THERMAL_VOLTAGE)
+
+        ic = saturation * (exp_be - exp_bc) - saturation / REVERSE_BETA * (exp_bc - 1)
+        ib = saturation / self._bjt_beta * (exp_be - 1) + saturation / REVERSE_BETA * (
+            exp_bc - 1
+        )
+        dic_be = saturation * slope_be / THERMAL_VOLTAGE
+        dic_bc = -saturation * slope_bc / THERMAL_VOLTAGE * (1 + 1 / REVERSE_BETA)
+        dib_be = saturation / self._bjt_beta * slope_be / THERMAL_VOLTAGE
+        dib_bc = saturation / REVERSE_BETA * slope_bc / THERMAL_VOLTAGE
+
+        ic += dic_be * (vbe - vbe_limited) + dic_bc * (vbc - vbc_limited)
+        ib += dib_be * (vbe - vbe_limited) + dib_bc * (vbc - vbc_limited)
+
+        # Rows: collector, base, emitter. Columns: collector, base, emitter
+        collector_row = np.stack([-dic_bc, dic_be + dic_bc, -dic_be], axis=1)
+        base_row = np.stack([-dib_bc, dib_be + dib_bc, -dib_be], axis=1)
+        bjt_jacobian = np.stack(
+            [collector_row, base_row, -(collector_row + base_row)], axis=1
+        )
+        bjt_currents = np.stack([p * ic, p * ib, -p * (ic + ib)], axis=1)
+
+        # Square law model. If vds < 0, drain and source swap roles.
+        d, g, s = self._mos_nodes.T
+        p = self._mos_polarity
+        k = self._mos_k
+        lam = self._mos_lambda
+        vds = p * (v[d] - v[s])
+        swapped = vds < 0
+        vgs = np.where(swapped, p * (v[g] - v[d]), p * (v[g] - v[s]))
+        vds = np.abs(vds)
+        overdrive = vgs - self._mos_threshold
+        on = overdrive > 0
+        saturated = vds >= overdrive
+        clm = 1 + lam * vds
+
+        triode = overdrive * vds - vds**2 / 2
+        current = np.where(saturated, k / 2 * overdrive**2, k * triode) * clm
+        gm = np.where(saturated, k * overdrive, k * vds) * clm
+        gds = np.where(
+            saturated,
+            k / 2 * overdrive**2 * lam,
+            k * (overdrive - vds) * clm + k * triode * lam,
+        )
+        current, gm, gds = current * on, gm * on, gds * on
+
+        # Rows: drain, source. Columns: drain, gate, source
+        drain_row = np.where(
+            swapped[:, None],
+            np.stack([gm + gds, -gm, -gds], axis=1),
+            np.stack([gds, gm, -gm - gds], axis=1),
+        )
+        mos_jacobian = np.stack([drain_row, -drain_row], axis=1)
+        drain_current = np.where(swapped, -1, 1) * p * current
+        mos_currents = np.stack([drain_current, -drain_current], axis=1)
+
+        currents = np.concatenate([bjt_currents.reshape(-1), mos_currents.reshape(-1)])
+        jacobian = np.concatenate([bjt_jacobian.reshape(-1), mos_jacobian.reshape(-1)])
+        return (
+            currents,
+            jacobian[self._device_mask],
+            (vbe_limited, vbc_limited),
+            limited_be or limited_bc,
+        )
+
+    def _newton(self, linear, G, b, x, junctions, cold):
+        for iteration in range(1, self.max_iterations + 1):
+            currents, jacobian, junctions, limited = self._devices(
+                x, junctions, initial=cold and iteration == 1
+            )
+            F = np.zeros(self._size + 1)
+            np.add.at(F, self._current_rows, currents)
+            F = G @ x - b + F[:-1]
+
+            J = self._matrix(
+                linear
+                + np.bincount(self._device_slots, weights=jacobian, minlength=self._nnz)
+            )
+            # MNA matrices are (nearly) structurally symmetric, which keeps
+            # the fill-in of the LU factors small.
+            try:
+                dx = splu(
+                    J,
+                    permc_spec="MMD_AT_PLUS_A",
+                    options={"SymmetricMode": True},
+                ).solve(-F)
+            except RuntimeError:
+                raise RuntimeError("The circuit matrix is singular.")
+            if not np.all(np.isfinite(dx)):
+                raise RuntimeError("The circuit matrix is singular.")
+
+            # Node voltages can only move by about the largest source per
+            # iteration, so high gain stages cannot run away.
+            step = max(10, np.max(np.abs(b), initial=0))
+            node_dx = dx[self._node_rows]
+            limited = limited or np.any(np.abs(node_dx) > step)
+            dx[self._node_rows] = np.clip(node_dx, -step, step)
+
+            x = x + dx
+            if not limited and np.max(np.abs(dx), initial=0) <= self.tolerance * (
+                1 + np.max(np.abs(x), initial=0)
+            ):
+                return x, junctions, iteration
+
+        raise RuntimeError(
+            "Newton-Raphson did not converge in "
+            + str(self.max_iterations)
+            + " iterations."
+        )
+
+    def _source_stepping(self, linear, G, b):
+        # Ramp every source up from 0, starting each step from the last
+        # solution. Slower, but converges for circuits that a cold start
+        # cannot handle.
+        x, junctions = np.zeros(self._size), self.__initial_junctions()
+        scale, step, cold, iterations = 0, 0.1, True, 0
+        while scale < 1:
+            target = min(1, scale + step)
+            try:
+                x_new, junctions_new, count = self._newton(
+                    linear, G, b * target, x, junctions, cold
+                )
+            except RuntimeError:
+                step /= 2
+                if step < 1e-4:
+                    raise
+                continue
+
+            x, junctions, scale, cold = x_new, junctions_new, target, False
+            iterations += count
+            step = min(2 * step, 0.5)
+
+        return x, junctions, iterations
+
+    def solve(self, warm_start=True, **values):
+        # Capacitor values are allowed, even though they do not matter at DC
+        names = {element[1] for element in self.topology[2]}
+        unknown = [name for name in values if name not in names]
+        if len(unknown) > 0:
+            raise ValueError("Unknown values for: " + ", ".join(unknown))
+
+        values = {**self.defaults, **values}
+        missing = self._names - set(values)
+        if len(missing) > 0:
+            raise ValueError("Missing values for: " + ", ".join(sorted(missing)))
+
+        self.__read_parameters()
+
+        # The linear part does not change between iterations
+        linear = np.bincount(
+            self._linear_slots,
+            weights=[
+                coefficient / values[name] if name is not None else coefficient
+                for _, _, coefficient, name in self._linear
+            ],
+            minlength=self._nnz,
+        )
+        linear += np.bincount(
+            self._gmin_slots,
+            weights=np.full(len(self._gmin_slots), GMIN),
+            minlength=self._nnz,
+        )
+        G = self._matrix(linear)
+
+        b = np.zeros(self._size)
+        for r, sign, name in self._sources:
+            b[r] += sign * values[name]
+
+        cold = not warm_start or not self._solved
+        if cold:
+            x, junctions = np.zeros(self._size), self.__initial_junctions()
+        else:
+            x, junctions = self._x.copy(), self._junctions
+
+        try:
+            x, junctions, self.iterations = self._newton(
+                linear, G, b, x, junctions, cold
+            )
+        except RuntimeError:
+            if not cold:
+                raise
+            x, junctions, self.iterations = self._source_stepping(linear, G, b)
+
+        self._x = x
+        self._junctions = junctions
+        self._solved = True
+
+        voltages = np.zeros(self._node_count)
+        for node, r in self._rows.items():
+            voltages[node] = x[r]
+        for node, voltage in zip(self.circuit.node_list, voltages):
+            node.voltage = voltage
+
+        return voltages
@@ -1,5 +1,6 @@
 from manim import *
 import math
+import warnings
 
 
 class Source(VMobject):
@@ -16,6 +17,7 @@ class Source(VMobject):
         # initialize the vmobject
         super().__init__(**kwargs)
         self._direction = direction
+        self.value = value
 
         # If value is a number or override dependent is False
         if dependent is False or type(value) is int or type(value) is float:
@@ -67,10 +69,80 @@ class Source(VMobject):
         return self
 
 
+class LogicGate(VMobject):
+    # Name of the logic function, used by the DigitalSimulator
+    logic = None
+
+    def __init__(
+        self,
+        body,
+        inputs,
+        outputs=("output",),
+        inverted=False,
+        inset=0,
+        label=None,
+        **kwargs,
+    ):
+        # initialize the vmobject
+        super().__init__(**kwargs)
+
+        self._plots = VGroup()
+        self._terminals = {}
+
+        self.main_body = body.set_color(WHITE)
+
+        # Bubble for the inverted gates (NAND, NOR, XNOR, NOT)
+        if inverted:
+            self.main_body.add(
+                Circle(radius=0.08)
+                .set_color(WHITE)
+                .next_to(self.main_body, RIGHT, buff=0)
+            )
+        self.add(self.main_body)
+
+        # Rails, spread evenly along the left and right of the body
+        self.rails = VGroup()
+        left = self.main_body.get_left()[0]
+        right = self.main_body.get_right()[0]
+        y = self.main_body.get_center()[1]
+        for names, start, end in (
+            (inputs, left + inset, left - 0.25),
+            (outputs, right, right + 0.25),
+        ):
+            if len(names) == 1:
+                offsets = [0]
+            else:
+                offsets = np.linspace(
+                    self.main_body.height / 4, -self.main_body.height / 4, len(names)
+                )
+            for name, offset in zip(names, offsets):
+                self.rails.add(Line([start, y + offset, 0], [end, y + offset, 0]))
+                self._plots.add(Dot([end, y + offset, 0]).set_opacity(0))
+                self._terminals[name] = self._plots[-1]
+
+        self._labels = VGroup()
+        if label is not None:
+            self._labels.add(
+                MathTex(str(label)).scale(0.5).next_to(self.main_body, DOWN, buff=0.1)
+            )
+
+        self.add(self.rails, self._labels, self._plots)
+
+    def get_terminals(self, val):
+        # The terminals are invisible Dot()s, so they follow shift/rotate
+        return self._terminals[val].get_center()
+
+
 class Circuit(VMobject):
-    def __init__(self, **kwargs):
+    def __init__(self, resolution=2**-10, **kwargs):
         super().__init__(**kwargs)
 
+        # Every terminal and wire coordinate is snapped to an integer lattice
+        # with this spacing when it is added. Two coordinates are connected
+        # if and only if they snap to the same lattice point.
+        self.resolution = resolution
+        self._dc_solver = None
+
         # Get a VGroup() of components
         self.component_list = VGroup()
 
@@ -88,9 +160,9 @@ class Circuit(VMobject):
         # Check if a turn is necessary. Only satisfiable if:
         # 1. diagonal flag is not set/overriden to True
         # 2. end1.x != end2.x and end1.y != end2.y
-        if (
-            not math.isclose(end1[0], end2[0]) and not math.isclose(end1[1], end2[1])
-        ) and diagonal is not True:
+        key1 = quantize(end1, self.resolution)
+        key2 = quantize(end2, self.resolution)
+        if (key1[0] != key2[0] and key1[1] != key2[1]) and diagonal is not True:
             # Define the turn
             if invert is True:
                 turn = [end2[0], end1[1], 0]
@@ -106,6 +178,37 @@ class Circuit(VMobject):
         for component in args:
             self.component_list.add(component)
 
+    def get_netlist(self):
+        from .analysis import build_netlist
+
+        return build_netlist(self)
+
+    def solve_symbolic(self, simplify=True):
+        # Node voltages as sympy expressions of the component labels.
+        # Requires sympy: pip install manim-circuit[symbolic]
+        from .analysis import solve_symbolic
+
+        return solve_symbolic(self, simplify)
+
+    def solve_dc(self, **values):
+        # DC operating point, for circuits with transistors too.
+        # The solver is kept, so the next call starts from this solution.
+        from .analysis import get_topology
+        from .nonlinear import DCSolver
+
+        # The solver keeps the values and the transistors it was built with,
+        # so it is rebuilt if any of them were changed or replaced.
+        solver = self._dc_solver
+        if (
+            solver is None
+            or (solver.topology, solver.defaults) != get_topology(self)
+            or len(solver.components) != len(self.component_list)
+            or any(a is not b for a, b in zip(solver.components, self.component_list))
+        ):
+            self._dc_solver = DCSolver(self)
+
+        return self._dc_solver.solve(**values)
+
     def add_wire(
         self,
         end1,
@@ -118,7 +221,7 @@ class Circuit(VMobject):
         # First wire
         if len(self.node_list) == 0:
             # Create the first node
-            node = Node()
+            node = Node(resolution=self.resolution)
             node.add_wire(wire)
 
             # Adding the newly editted node
@@ -145,11 +248,10 @@ class Circuit(VMobject):
                         if not type(dot) == bool:
                             node.add_dot(dot)
 
-
             # This means that the wire is not attached to any node,
             # Make a new node.
             if len(intersections) == 0:
-                node = Node()
+                node = Node(resolution=self.resolution)
                 node.add_wire(wire)
                 node.set_color(WHITE)
                 self.node_list.add(node)
@@ -169,7 +271,7 @@ class Circuit(VMobject):
 
 
 class Node(VMobject):
-    def __init__(self, **kwargs):
+    def __init__(self, resolution=2**-10, **kwargs):
         super().__init__(**kwargs)
 
         # NOTE In a future update, I want to try to
@@ -180,42 +282,100 @@ class Node(VMobject):
         # Voltage functionality has not been added in v2 yet.
         self.voltage = None
 
+        self.resolution = resolution
         self.coords = []
         self.junction_dots = VGroup()
 
+        # Lookup tables of lattice keys, updated as wires are added.
+        # self.coords keeps the original floats for rendering.
+        self._ends = {}
+        self._vertices = set()
+        self._horizontal = {}
+        self._vertical = {}
+        self._diagonal = []
+
         self.add(self.junction_dots)
 
         self.set_color(WHITE)
 
+    def key(self, coord):
+        return quantize(coord, self.resolution)
+
+    def nearby_keys(self, coord):
+        return nearby_keys(coord, self.resolution)
+
+    def __draw(self, path):
+        self.start_new_path(path[0])
+        for coord in path[1:]:
+            self.add_line_to(np.array(coord))
+
     def __update(self):
         self.clear_points()
         for path in self.coords:
-            self.start_new_path(path[0])
-            for coord in path[1:]:
-                self.add_line_to(np.array(coord))
+            self.__draw(path)
+
+    def __index_wire(self, i):
+        keys = [self.key(coord) for coord in self.coords[i]]
+
+        # Which end of which wire is at this key. 0 is start, 1 is end.
+        self._ends.setdefault(keys[0], []).append((i, 0))
+        self._ends.setdefault(keys[-1], []).append((i, 1))
+        self._vertices.update(keys[1:-1])
+        self.__index_segments(keys)
+
+    def __index_segments(self, keys):
+        # Segments are stored by the line they are on, so a coordinate
+        # only has to be compared against segments on the same line.
+        for a, b in zip(keys, keys[1:]):
+            if a[1] == b[1] and a[2] == b[2]:
+                self._horizontal.setdefault((a[1], a[2]), []).append(
+                    (min(a[0], b[0]), max(a[0], b[0]))
+                )
+            elif a[0] == b[0] and a[2] == b[2]:
+                self._vertical.setdefault((a[0], a[2]), []).append(
+                    (min(a[1], b[1]), max(a[1], b[1]))
+                )
+            else:
+                self._diagonal.append((a, b))
+
+    def __on_segment(self, key):
+        for low, high in self._horizontal.get((key[1], key[2]), []):
+            if low < key[0] < high:
+                return True
+
+        for low, high in self._vertical.get((key[0], key[2]), []):
+            if low < key[1] < high:
+                return True
+
+        for a, b in self._diagonal:
+            if key == a or key == b or key[2] != a[2]:
+                continue
+            dx, dy = b[0] - a[0], b[1] - a[1]
+            # Exact integer math. A distance of one lattice step from the
+            # line is allowed, since both ends were rounded.
+            cross = dx * (key[1] - a[1]) - dy * (key[0] - a[0])
+            if (
+                abs(cross) <= max(abs(dx), abs(dy))
+                and min(a[0], b[0]) <= key[0] <= max(a[0], b[0])
+                and min(a[1], b[1]) <= key[1] <= max(a[1], b[1])
+            ):
+                return True
+
+        return False
 
     def check_coord(self, coord):
         # coord is to be checked.
         # return a non-False value if:
-        # 1. It paired coordinates in self.coords (and not endpoint)
-        #       return True
-        # 2. It is validated by line_intersection "proof"
+        # 1. It is a corner, or in the middle of a wire (a junction)
         #       return the coordinate
-        for wire in self.coords:
-            # new wire is connected to an end of a wire.
-            if np.allclose(coord, wire[0]) or np.allclose(coord, wire[-1]):
-                return True
+        # 2. It is at the end of a wire
+        #       return True
+        keys = self.nearby_keys(coord)
+        if any(key in self._vertices or self.__on_segment(key) for key in keys):
+            return coord
 
-            # reading the endpoints of wire
-            for i in range(len(wire) - 1):
-                coord_is_in_between_a_line = validate_forms_approx_line(
-                    coord, [wire[i], wire[i + 1]]
-                )
-                # Coord matches a coordinate that is in the middle.
-                if (
-                    np.allclose(coord, wire[i]) and i != 0
-                ) or coord_is_in_between_a_line:
-                    return coord
+        if any(key in self._ends for key in keys):
+            return True
 
         return False
 
@@ -227,38 +387,59 @@ class Node(VMobject):
     def add_wire(self, wire_param):
         if len(self.coords) == 0:
             self.coords.append(wire_param)
-            self.__update()
+            self.__index_wire(0)
+            self.__draw(wire_param)
             return
 
-        # Check if continuity in any wire (assume False)
-        cont = False
+        # Find the first wire that shares an end with the new wire.
+        # (wire index, end of the wire, end of the new wire)
+        # (wire index, end of the wire, end of the new wire, key of the end)
+        matches = []
+        for param_end, coord in ((0, wire_param[0]), (1, wire_param[-1])):
+            for key in self.nearby_keys(coord):
+                for i, end in self._ends.get(key, []):
+                    matches.append((i, end, param_end, key))
+
         # wire is a single path of arbitrary length. It's a dot chain.
-        for wire, i in zip(self.coords, range(len(self.coords))):
-            if np.allclose(wire[0], wire_param[0]):
+        if len(matches) > 0:
+            i, end, param_end, joint = min(matches)
+            wire = self.coords[i]
+            if end == 0 and param_end == 0:
                 self.coords[i] = wire_param[1:][::-1] + wire
-                cont = True
-                break
-
-            elif np.allclose(wire[0], wire_param[-1]):
+            elif end == 0 and param_end == 1:
                 self.coords[i] = wire_param[:-1] + wire
-                cont = True
-                break
-
-            elif np.allclose(wire[-1], wire_param[0]):
+            elif end == 1 and param_end == 0:
                 self.coords[i] = wire + wire_param[1:]
-                cont = True
-                break
-
-            elif np.allclose(wire[-1], wire_param[-1]):
+            else:
                 self.coords[i] = wire + wire_param[:-1][::-1]
-                cont = True
-                break
+
+            # Only the new part of wire i has to be indexed. The end that was
+            # joined becomes a corner, and the far end of the new wire is the
+            # new end of wire i.
+            keys = [self.key(coord) for coord in wire_param]
+            own, far = (keys[0], keys[-1]) if param_end == 0 else (keys[-1], keys[0])
+            self._ends[joint].remove((i, end))
+            if len(self._ends[joint]) == 0:
+                del self._ends[joint]
+            self._ends.setdefault(far, []).append((i, end))
+            # The matched key may be a neighbour of the new wire's own key.
+            self._vertices.update((joint, own))
+            self._vertices.update(keys[1:-1])
+            self.__index_segments(keys)
+
+            # Wire i is drawn as one path. If it is the last path and grew at
+            # its end, the new part is drawn on. Otherwise it is redrawn.
+            if i == len(self.coords) - 1 and end == 1:
+                for coord in self.coords[i][len(wire) :]:
+                    self.add_line_to(np.array(coord))
+            else:
+                self.__update()
 
         # Aggregated data
-        if cont is not True:
+        else:
             self.coords.append(wire_param)
-
-        self.__update()
+            self.__index_wire(len(self.coords) - 1)
+            self.__draw(wire_param)
 
     def merge(self, node, wire=False):
         if wire is not False:
@@ -268,20 +449,58 @@ class Node(VMobject):
         for dot in node.junction_dots:
             self.junction_dots.add(dot)
 
-        self.coords = self.coords + node.coords
+        # The wires of the other node are indexed and drawn after our own.
+        for wire in node.coords:
+            self.coords.append(wire)
+            self.__index_wire(len(self.coords) - 1)
+            self.__draw(wire)
         node.clear_points()
-        self.__update()
+
+
+def quantize(coord, resolution=2**-10):
+    # Snap a coordinate to the nearest point of an integer lattice.
+    # The result is hashable and can be compared exactly.
+    # The default resolution is a power of two, so coordinates like 0.3125
+    # land exactly on a lattice point instead of halfway between two.
+    return tuple(int(round(float(c) / resolution)) for c in coord)
+
+
+def nearby_keys(coord, resolution=2**-10):
+    # The key of coord, plus the neighbouring keys on any axis where coord is
+    # (up to float noise) halfway between two lattice points. Float noise
+    # could have rounded the same point either way.
+    keys = [quantize(coord, resolution)]
+    for axis, c in enumerate(coord):
+        scaled = float(c) / resolution
+        if abs(scaled - math.floor(scaled) - 0.5) < 1e-6:
+            for key in list(keys):
+                other = list(key)
+                other[axis] = math.floor(scaled) + (key[axis] == math.floor(scaled))
+                keys.append(tuple(other))
+    return keys
 
 
 def distance(a, b):
+    # Deprecated, connectivity uses quantize() now.
+    warnings.warn(
+        "distance() is deprecated and will be removed.", DeprecationWarning, 2
+    )
     return np.sqrt(np.sum([i * i for i in np.array(a) - np.array(b)]))
 
 
 def validate_forms_approx_line(coord, line, tolerance=1e-5):
+    # Deprecated, connectivity uses quantize() now.
     # Check if the sum of the distance(s) between a coordinate to the end(s) of a line
     # equates to the distance of the line
-    return math.isclose(
-        distance(coord, line[0]) + distance(coord, line[1]),
-        distance(*line),
-        rel_tol=tolerance,
+    warnings.warn(
+        "validate_forms_approx_line() is deprecated and will be removed.",
+        DeprecationWarning,
+        2,
     )
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        return math.isclose(
+            distance(coord, line[0]) + distance(coord, line[1]),
+            distance(*line),
+            rel_tol=tolerance,
+        )
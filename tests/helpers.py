@@ -0,0 +1,26 @@
+from manim_circuit import Circuit
+from manim_circuit.analysis import find_node
+
+
+def build(components, nets):
+    # Every component is tilted, so no two terminals share an x or y. Every
+    # terminal then gets its own lane on the right, and every net its own
+    # bus below, so wires only touch where they are meant to.
+    circuit = Circuit()
+    for i, component in enumerate(components):
+        component.rotate(0.3).shift([0, -3 * i, 0])
+    circuit.add_components(*components)
+
+    lane = 20
+    for bus, terminals in enumerate(nets):
+        y = -40 - bus
+        circuit.add_wire([lane, y, 0], [lane + len(terminals) - 1, y, 0])
+        for component, name in terminals:
+            circuit.add_wire(component.get_terminals(name), [lane, y, 0], invert=True)
+            lane += 1
+
+    return circuit
+
+
+def node_of(circuit, component, name):
+    return find_node(circuit, component.get_terminals(name))
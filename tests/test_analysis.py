@@ -0,0 +1,140 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("manim")
+pytest.importorskip("sympy")
+
+from manim import PI, RIGHT, UP
+from manim_circuit import Ground, Inductor, Opamp, Resistor, VoltageSource
+from manim_circuit import analysis
+from manim_circuit.analysis import component_names, get_topology, parse_value
+
+from .helpers import build, node_of
+
+
+def divider(top=1000, bottom=3000, inductor=False):
+    # 10 V over two resistors, optionally with an inductor in series
+    source = VoltageSource(10)
+    upper = Resistor(label=top)
+    lower = Resistor(label=bottom)
+    ground = Ground()
+    components = [source, upper, lower]
+    nets = [[(source, "positive"), (upper, "left")]]
+    if inductor:
+        coil = Inductor(label="1m")
+        components.append(coil)
+        nets += [
+            [(upper, "right"), (coil, "left")],
+            [(coil, "right"), (lower, "left")],
+        ]
+    else:
+        nets.append([(upper, "right"), (lower, "left")])
+    nets.append([(lower, "right"), (source, "negative"), (ground, "ground")])
+
+    circuit = build(components + [ground], nets)
+    return circuit, node_of(circuit, lower, "left")
+
+
+def test_divider_matches_solve_dc():
+    circuit, middle = divider()
+    solution = circuit.solve_symbolic(simplify=False)
+    assert solution.evaluate(middle) == pytest.approx(7.5)
+    assert solution.evaluate(middle) == pytest.approx(circuit.solve_dc()[middle])
+
+
+def test_evaluate_arrays():
+    circuit, middle = divider()
+    solution = circuit.solve_symbolic()
+    np.testing.assert_allclose(
+        solution.evaluate(middle, R_2=np.array([1000, 3000, 9000])), [5, 7.5, 9]
+    )
+
+
+def test_inductor_is_a_short_at_dc():
+    circuit, middle = divider(inductor=True)
+    solution = circuit.solve_symbolic(simplify=False)
+    assert solution.evaluate(middle) == pytest.approx(7.5)
+    assert solution.evaluate(middle, s=np.array([0, 1j]))[0] == pytest.approx(7.5)
+
+
+def test_transfer_function_does_not_need_the_source_value():
+    source = VoltageSource("V_s")
+    upper = Resistor(label=1000)
+    lower = Resistor(label=3000)
+    ground = Ground()
+    circuit = build(
+        [source, upper, lower, ground],
+        [
+            [(source, "positive"), (upper, "left")],
+            [(upper, "right"), (lower, "left")],
+            [(lower, "right"), (source, "negative"), (ground, "ground")],
+        ],
+    )
+    solution = circuit.solve_symbolic()
+    middle = node_of(circuit, lower, "left")
+    assert solution.evaluate_transfer_function(middle, source) == pytest.approx(0.75)
+    with pytest.raises(ValueError):
+        solution.evaluate(middle)
+
+
+def test_cache_hit(monkeypatch):
+    solves = []
+    solve_topology = analysis._solve_topology
+
+    def counting(topology):
+        solves.append(topology)
+        return solve_topology(topology)
+
+    monkeypatch.setattr(analysis, "_solve_topology", counting)
+    analysis._SYMBOLIC_CACHE.clear()
+
+    first, _ = divider()
+    second, middle = divider(top=2000)
+    one = first.solve_symbolic()
+    two = second.solve_symbolic()
+    assert len(solves) == 1
+    assert one._solved is two._solved
+    assert two.evaluate(middle) == pytest.approx(6)
+
+
+def test_default_values():
+    assert parse_value("10k") == pytest.approx(1e4)
+    assert parse_value("4.7u") == pytest.approx(4.7e-6)
+    assert parse_value("R1") is None
+
+    circuit, _ = divider(top="10k", bottom="30k")
+    _, defaults = get_topology(circuit)
+    assert defaults["R_1"] == pytest.approx(1e4)
+    assert defaults["R_2"] == pytest.approx(3e4)
+
+
+def test_generated_names_skip_labels():
+    netlist = [
+        (VoltageSource(1), {}),
+        (Resistor(label=100), {}),
+        (Resistor(label="R_1"), {}),
+    ]
+    names = [name for _, name in component_names(netlist)]
+    assert len(set(names)) == 3
+    assert names[2] == "R_1"
+
+
+def test_unknown_values_are_rejected():
+    circuit, middle = divider()
+    with pytest.raises(ValueError):
+        circuit.solve_symbolic().evaluate(middle, R_9=1)
+
+
+def test_opamp_terminals_follow_the_opamp():
+    opamp = Opamp()
+    output = opamp.get_terminals("output")
+    assert opamp.get_terminals("positive_bias") is None
+
+    opamp.shift(RIGHT * 2 + UP)
+    np.testing.assert_allclose(opamp.get_terminals("output"), output + [2, 1, 0])
+
+    center = opamp.get_center()
+    opamp.rotate(PI, about_point=center)
+    np.testing.assert_allclose(
+        opamp.get_terminals("output"), 2 * center - (output + [2, 1, 0]), atol=1e-9
+    )
@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("manim")
+
+from manim import RIGHT
+from manim_circuit import Circuit, DFlipFlop, DigitalSimulator, NotGate
+from manim_circuit.analysis import find_node
+
+
+def net(circuit, component, terminal):
+    return find_node(circuit, component.get_terminals(terminal))
+
+
+def test_flip_flop_clocked_by_flip_flop_matches_packed():
+    # Both flip-flops sample A. The second one is clocked by q of the first.
+    ff1 = DFlipFlop()
+    ff2 = DFlipFlop().shift(RIGHT * 3)
+    circuit = Circuit()
+    circuit.add_components(ff1, ff2)
+
+    # A
+    circuit.add_wire([-1.5, 0.375, 0], ff1.get_terminals("d"))
+    circuit.add_wire([-1.25, 0.375, 0], [2, 1.25, 0])
+    circuit.add_wire([2, 1.25, 0], ff2.get_terminals("d"))
+    # CLK
+    circuit.add_wire([-1.5, -0.375, 0], ff1.get_terminals("clk"))
+    # q1 -> clk of ff2
+    circuit.add_wire(ff1.get_terminals("q"), [1.5, 0.375, 0])
+    circuit.add_wire([1.5, 0.375, 0], ff2.get_terminals("clk"))
+    # q2
+    circuit.add_wire(ff2.get_terminals("q"), [4.5, 0.375, 0])
+
+    sim = DigitalSimulator(circuit)
+    a = net(circuit, ff1, "d")
+    clk = net(circuit, ff1, "clk")
+    sim.set_input(a, [1, 1, 0, 1, 0, 0, 1, 0, 1, 1, 1])
+    sim.set_input(clk, [0, 1])
+    sim.run(64)
+
+    levels = [sim._truth_table(level) for level in sim._levelize(False)]
+    stepped = sim._run_stepped(levels, 64)
+
+    nodes = len(circuit.node_list)
+    np.testing.assert_array_equal(
+        np.unpackbits(sim._packed[:nodes], axis=1, count=64),
+        np.unpackbits(stepped[:nodes], axis=1, count=64),
+    )
+    assert sim.waveform(net(circuit, ff2, "q")).any()
+
+
+def test_ripple_counter():
+    # Each flip-flop toggles, and the second one is clocked by q_bar of the
+    # first, so q2 toggles at half the rate of q1.
+    ff1 = DFlipFlop()
+    ff2 = DFlipFlop().shift(RIGHT * 3)
+    circuit = Circuit()
+    circuit.add_components(ff1, ff2)
+
+    # CLK
+    circuit.add_wire([-1.5, -0.375, 0], ff1.get_terminals("clk"))
+    # q1_bar -> clk of ff2, and back to d of ff1
+    circuit.add_wire(ff1.get_terminals("q_bar"), ff2.get_terminals("clk"))
+    circuit.add_wire([1, -0.375, 0], [-1, 1, 0])
+    circuit.add_wire([-1, 1, 0], ff1.get_terminals("d"))
+    # q2_bar -> d of ff2
+    circuit.add_wire(ff2.get_terminals("q_bar"), [4, 1.25, 0], invert=True)
+    circuit.add_wire([4, 1.25, 0], [1.75, 1.25, 0])
+    circuit.add_wire([1.75, 1.25, 0], ff2.get_terminals("d"))
+
+    sim = DigitalSimulator(circuit)
+    sim.set_input(net(circuit, ff1, "clk"), [0, 1]).run(16)
+
+    q1_bar = sim.waveform(net(circuit, ff1, "q_bar"))
+    q2_bar = sim.waveform(net(circuit, ff2, "q_bar"))
+    np.testing.assert_array_equal(
+        q1_bar.astype(int), [1, 0, 0, 1, 1, 0, 0, 1, 1, 0, 0, 1, 1, 0, 0, 1]
+    )
+    np.testing.assert_array_equal(
+        q2_bar.astype(int), [1, 1, 1, 0, 0, 0, 0, 1, 1, 1, 1, 0, 0, 0, 0, 1]
+    )
+
+
+def test_cycles_past_the_end_are_rejected():
+    gate = NotGate()
+    circuit = Circuit()
+    circuit.add_components(gate)
+    circuit.add_wire([-1.5, 0, 0], gate.get_terminals("input"))
+    circuit.add_wire(gate.get_terminals("output"), [1.5, 0, 0])
+
+    sim = DigitalSimulator(circuit)
+    a = net(circuit, gate, "input")
+    # 10 cycles fill two bytes, so cycles 10 to 15 are padding
+    sim.set_input(a, [1]).run(10)
+    assert sim.level(net(circuit, gate, "output"), 9) is False
+    for cycle in (10, 16, -1):
+        with pytest.raises(ValueError):
+            sim.level(a, cycle)
+        with pytest.raises(ValueError):
+            sim.color_nodes(cycle)
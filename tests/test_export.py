@@ -0,0 +1,59 @@
+import gzip
+import io
+import json
+
+import pytest
+
+pytest.importorskip("manim")
+
+from manim import PI, RED, Scene
+from manim_circuit import Circuit, Resistor, export_frame_data
+
+
+class SmallCircuit(Scene):
+    def construct(self):
+        self.circuit = Circuit()
+        resistor = Resistor(label=100).rotate(PI / 2)
+        self.circuit.add_components(resistor)
+        self.circuit.add_wire(resistor.get_terminals("left"), [2, 2, 0])
+        self.add(self.circuit)
+
+        self.play(self.circuit.node_list[0].animate.set_color(RED), run_time=1)
+        self.wait(0.5)
+
+
+def read_frames(text):
+    lines = [json.loads(line) for line in text.splitlines()]
+    return lines[0], lines[1:]
+
+
+def test_frames_are_written_without_rendering():
+    file = io.StringIO()
+    scene = SmallCircuit()
+    export_frame_data(scene, file, frame_rate=10)
+    header, frames = read_frames(file.getvalue())
+
+    assert header["frame_rate"] == 10
+    # 1 s of play() and 0.5 s of wait() at 10 frames per second
+    assert len(frames) == 15
+    assert [frame["frame"] for frame in frames] == list(range(15))
+    assert frames[-1]["time"] == pytest.approx(1.5)
+    assert scene.renderer.time == pytest.approx(1.5)
+
+    colors = [frame["circuits"][0]["nodes"][0]["color"] for frame in frames]
+    assert colors[-1].upper() == RED.to_hex().upper()
+    assert len(set(colors[:10])) > 2
+
+    component = frames[0]["circuits"][0]["components"][0]
+    assert component["type"] == "Resistor"
+    assert component["angle"] == pytest.approx(PI / 2)
+
+
+def test_gzip_output(tmp_path):
+    path = tmp_path / "frames.jsonl.gz"
+    export_frame_data(SmallCircuit, str(path), frame_rate=4)
+    with gzip.open(path, "rt") as file:
+        header, frames = read_frames(file.read())
+
+    assert header["format"] == "manim-circuit-frames"
+    assert len(frames) == 6
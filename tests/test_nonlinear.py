@@ -0,0 +1,206 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("manim")
+optimize = pytest.importorskip("scipy.optimize")
+
+from manim_circuit import (
+    BJT,
+    MOSFET,
+    DCSolver,
+    Ground,
+    Resistor,
+    VoltageSource,
+)
+from manim_circuit.analysis import find_node
+
+from .helpers import build
+
+# Reference models, written out independently of the solver
+THERMAL_VOLTAGE = 0.025852
+
+
+def ebers_moll(vbe, vbc, beta=100, saturation_current=1e-14):
+    # Collector and base current of an NPN with a reverse beta of 1
+    forward = np.exp(vbe / THERMAL_VOLTAGE)
+    reverse = np.exp(vbc / THERMAL_VOLTAGE)
+    ic = saturation_current * (forward - reverse) - saturation_current * (reverse - 1)
+    ib = saturation_current / beta * (forward - 1) + saturation_current * (reverse - 1)
+    return ic, ib
+
+
+def square_law(vgs, vds, threshold=1, transconductance=1e-3):
+    overdrive = vgs - threshold
+    if overdrive <= 0:
+        return 0
+    if vds >= overdrive:
+        return transconductance / 2 * overdrive**2
+    return transconductance * (overdrive * vds - vds**2 / 2)
+
+
+def voltage(circuit, voltages, component, name):
+    return voltages[find_node(circuit, component.get_terminals(name))]
+
+
+def common_emitter(vcc=10, rc=1000, rb=1e6, polarity="npn"):
+    source = VoltageSource(vcc)
+    collector_resistor = Resistor(label=rc)
+    base_resistor = Resistor(label=rb)
+    bjt = BJT(polarity=polarity)
+    ground = Ground()
+
+    if polarity == "npn":
+        supply = [(collector_resistor, "left"), (base_resistor, "left")]
+        common = [(bjt, "emitter")]
+    else:
+        # Mirrored: the emitter is at the supply, the resistors go to ground
+        supply = [(bjt, "emitter")]
+        common = [(collector_resistor, "left"), (base_resistor, "left")]
+
+    circuit = build(
+        [source, collector_resistor, base_resistor, bjt, ground],
+        [
+            [(source, "positive")] + supply,
+            [(collector_resistor, "right"), (bjt, "collector")],
+            [(base_resistor, "right"), (bjt, "base")],
+            [(source, "negative"), (ground, "ground")] + common,
+        ],
+    )
+    return circuit, bjt
+
+
+def npn_reference(vcc=10, rc=1000, rb=1e6, beta=100, guess=(0.7, 5)):
+    def equations(v):
+        vb, vc = v
+        ic, ib = ebers_moll(vb, vb - vc, beta)
+        return [(vcc - vb) / rb - ib, (vcc - vc) / rc - ic]
+
+    return optimize.fsolve(equations, guess, xtol=1e-12)
+
+
+def test_npn_bias_point():
+    circuit, bjt = common_emitter()
+    voltages = circuit.solve_dc()
+    vb, vc = npn_reference()
+    assert voltage(circuit, voltages, bjt, "base") == pytest.approx(vb, abs=1e-4)
+    assert voltage(circuit, voltages, bjt, "collector") == pytest.approx(vc, abs=1e-4)
+
+
+def test_pnp_bias_point():
+    circuit, bjt = common_emitter(polarity="pnp")
+    voltages = circuit.solve_dc()
+
+    # Same as the NPN, measured down from the supply
+    vb, vc = npn_reference()
+    assert voltage(circuit, voltages, bjt, "base") == pytest.approx(10 - vb, abs=1e-4)
+    assert voltage(circuit, voltages, bjt, "collector") == pytest.approx(
+        10 - vc, abs=1e-4
+    )
+
+
+def common_source(channel="n"):
+    supply = VoltageSource(5)
+    gate = VoltageSource(3 if channel == "n" else 2)
+    drain_resistor = Resistor(label=1000)
+    mosfet = MOSFET(channel=channel)
+    ground = Ground()
+
+    if channel == "n":
+        top, bottom = (drain_resistor, "left"), (mosfet, "source")
+    else:
+        top, bottom = (mosfet, "source"), (drain_resistor, "left")
+
+    circuit = build(
+        [supply, gate, drain_resistor, mosfet, ground],
+        [
+            [(supply, "positive"), top],
+            [(gate, "positive"), (mosfet, "gate")],
+            [(drain_resistor, "right"), (mosfet, "drain")],
+            [(supply, "negative"), (gate, "negative"), (ground, "ground"), bottom],
+        ],
+    )
+    return circuit, mosfet
+
+
+def test_nmos_bias_point():
+    circuit, mosfet = common_source("n")
+    voltages = circuit.solve_dc()
+    (vd,) = optimize.fsolve(
+        lambda v: [(5 - v[0]) / 1000 - square_law(3, v[0])], [2.5], xtol=1e-12
+    )
+    assert voltage(circuit, voltages, mosfet, "drain") == pytest.approx(vd, abs=1e-4)
+    assert vd == pytest.approx(3)
+
+
+def test_pmos_bias_point():
+    circuit, mosfet = common_source("p")
+    voltages = circuit.solve_dc()
+    (vd,) = optimize.fsolve(
+        lambda v: [v[0] / 1000 - square_law(5 - 2, 5 - v[0])], [2.5], xtol=1e-12
+    )
+    assert voltage(circuit, voltages, mosfet, "drain") == pytest.approx(vd, abs=1e-4)
+    assert vd == pytest.approx(2)
+
+
+def test_warm_start():
+    circuit, bjt = common_emitter()
+    circuit.solve_dc()
+    solver = circuit._dc_solver
+
+    voltages = circuit.solve_dc(V_0=10.1)
+    assert circuit._dc_solver is solver
+    assert solver.iterations <= 2
+    vb, vc = npn_reference(vcc=10.1)
+    assert voltage(circuit, voltages, bjt, "collector") == pytest.approx(vc, abs=1e-4)
+
+
+def test_device_parameters_are_read_on_every_solve():
+    circuit, bjt = common_emitter()
+    circuit.solve_dc()
+
+    bjt.beta = 50
+    voltages = circuit.solve_dc()
+    vb, vc = npn_reference(beta=50)
+    assert voltage(circuit, voltages, bjt, "collector") == pytest.approx(vc, abs=1e-4)
+
+
+def test_source_stepping_cold_start():
+    # A saturated transistor takes more Newton iterations from a cold start
+    # than allowed here, so the solver has to ramp the supply up instead.
+    circuit, bjt = common_emitter(rb=1e4)
+    solver = DCSolver(circuit, max_iterations=10)
+    voltages = solver.solve()
+    assert solver.iterations > 10
+
+    vb, vc = npn_reference(rb=1e4, guess=(0.7, 0.1))
+    assert voltage(circuit, voltages, bjt, "base") == pytest.approx(vb, abs=1e-4)
+    assert voltage(circuit, voltages, bjt, "collector") == pytest.approx(vc, abs=1e-4)
+
+
+def test_unknown_values_are_rejected():
+    circuit, bjt = common_emitter()
+    with pytest.raises(ValueError):
+        circuit.solve_dc(V_9=10)
+
+
+def test_replaced_component_rebuilds_the_solver():
+    source = VoltageSource(10)
+    upper = Resistor(label=1000)
+    lower = Resistor(label=1000)
+    ground = Ground()
+    circuit = build(
+        [source, upper, lower, ground],
+        [
+            [(source, "positive"), (upper, "left")],
+            [(upper, "right"), (lower, "left")],
+            [(lower, "right"), (source, "negative"), (ground, "ground")],
+        ],
+    )
+    assert voltage(circuit, circuit.solve_dc(), lower, "left") == pytest.approx(5)
+
+    # Same place as the old one, see build()
+    replacement = Resistor(label=3000).rotate(0.3).shift([0, -3 * 2, 0])
+    circuit.component_list.remove(lower)
+    circuit.add_components(replacement)
+    voltages = circuit.solve_dc()
+    assert voltage(circuit, voltages, replacement, "left") == pytest.approx(7.5)
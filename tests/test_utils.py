@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("manim")
+
+from manim_circuit import Circuit
+from manim_circuit.utils import distance, quantize, validate_forms_approx_line
+
+# Float noise, as left behind by rotating or shifting a component
+NOISE = 1e-15
+
+
+def dots(node):
+    return [tuple(np.round(dot.get_center(), 6)) for dot in node.junction_dots]
+
+
+def test_quantize_returns_integers():
+    key = quantize([0.3125, -0.0625, 0])
+    assert key == (320, -64, 0)
+    assert all(type(c) is int for c in key)
+    assert quantize([0.3125 + NOISE, 0.3125 - NOISE, 0]) == (320, 320, 0)
+
+
+def test_noisy_ends_join():
+    circuit = Circuit()
+    circuit.add_wire([0, 0, 0], [0.3125, 0, 0])
+    circuit.add_wire([0.3125 + NOISE, 0, 0], [0.3125 + NOISE, 1, 0])
+    assert len(circuit.node_list) == 1
+    assert dots(circuit.node_list[0]) == []
+
+
+def test_noisy_ends_join_on_a_rounding_boundary():
+    # 0.0625 is halfway between two lattice points of 1e-3
+    circuit = Circuit(resolution=1e-3)
+    circuit.add_wire([0, 0, 0], [0.0625 - NOISE, 0, 0])
+    circuit.add_wire([0.0625 + NOISE, 0, 0], [0.0625 + NOISE, 1, 0])
+    assert len(circuit.node_list) == 1
+
+
+def test_t_junction():
+    circuit = Circuit()
+    circuit.add_wire([0, 0, 0], [2, 0, 0])
+    circuit.add_wire([1, NOISE, 0], [1, 1, 0])
+    assert len(circuit.node_list) == 1
+    assert dots(circuit.node_list[0]) == [(1, 0, 0)]
+
+
+def test_corner_junction():
+    circuit = Circuit()
+    circuit.add_wire([0, 0, 0], [2, 2, 0])
+    circuit.add_wire([0, 2, 0], [-1, 2, 0])
+    assert len(circuit.node_list) == 1
+    assert dots(circuit.node_list[0]) == [(0, 2, 0)]
+
+
+def test_separate_and_crossing_wires():
+    circuit = Circuit()
+    circuit.add_wire([0, 0, 0], [2, 0, 0])
+    circuit.add_wire([0, 0.5, 0], [2, 0.5, 0])
+    assert len(circuit.node_list) == 2
+
+    # A wire that only passes over another wire is not connected to it
+    circuit = Circuit()
+    circuit.add_wire([0, 0, 0], [2, 0, 0])
+    circuit.add_wire([1, -1, 0], [1, 1, 0])
+    assert len(circuit.node_list) == 2
+    assert all(dots(node) == [] for node in circuit.node_list)
+
+
+def test_bridging_wire_merges_nodes():
+    circuit = Circuit()
+    circuit.add_wire([0, 0, 0], [1, 0, 0])
+    circuit.add_wire([0, 1, 0], [1, 1, 0])
+    circuit.add_wire([0.5, 0, 0], [0.5, 1, 0])
+    assert len(circuit.node_list) == 1
+    assert sorted(dots(circuit.node_list[0])) == [(0.5, 0, 0), (0.5, 1, 0)]
+
+
+def test_deprecated_helpers():
+    with pytest.deprecated_call():
+        assert distance([0, 0, 0], [3, 4, 0]) == pytest.approx(5)
+    with pytest.deprecated_call():
+        assert validate_forms_approx_line([1, 0, 0], [[0, 0, 0], [2, 0, 0]])